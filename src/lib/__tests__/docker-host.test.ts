@@ -0,0 +1,71 @@
+import fs from 'node:fs'
+import { isRunningInDocker, rewriteLocalhostToGateway } from '../docker-host'
+
+jest.mock('node:fs', () => ({
+  __esModule: true,
+  default: {
+    existsSync: jest.fn(() => false),
+    readFileSync: jest.fn(() => '0::/'),
+  },
+}))
+
+describe('isRunningInDocker', () => {
+  const originalRunningInDocker = process.env.RUNNING_IN_DOCKER
+
+  afterEach(() => {
+    if (originalRunningInDocker === undefined) {
+      delete process.env.RUNNING_IN_DOCKER
+    } else {
+      process.env.RUNNING_IN_DOCKER = originalRunningInDocker
+    }
+  })
+
+  it('probes the filesystem once per process', () => {
+    delete process.env.RUNNING_IN_DOCKER
+
+    expect(isRunningInDocker()).toBe(false)
+    expect(isRunningInDocker()).toBe(false)
+
+    expect(fs.existsSync).toHaveBeenCalledTimes(1)
+    expect(fs.readFileSync).toHaveBeenCalledTimes(1)
+  })
+
+  it('honours RUNNING_IN_DOCKER without probing', () => {
+    process.env.RUNNING_IN_DOCKER = 'true'
+
+    expect(isRunningInDocker()).toBe(true)
+  })
+})
+
+describe('rewriteLocalhostToGateway', () => {
+  const originalGateway = process.env.WORKER_HOST_GATEWAY
+
+  afterEach(() => {
+    if (originalGateway === undefined) {
+      delete process.env.WORKER_HOST_GATEWAY
+    } else {
+      process.env.WORKER_HOST_GATEWAY = originalGateway
+    }
+  })
+
+  it('rewrites localhost and 127.0.0.1 to host.docker.internal', () => {
+    delete process.env.WORKER_HOST_GATEWAY
+
+    expect(rewriteLocalhostToGateway('http://localhost:54321/storage/v1/object/a.png'))
+      .toBe('http://host.docker.internal:54321/storage/v1/object/a.png')
+    expect(rewriteLocalhostToGateway('http://127.0.0.1:3000/demo.jpg'))
+      .toBe('http://host.docker.internal:3000/demo.jpg')
+  })
+
+  it('uses WORKER_HOST_GATEWAY when set', () => {
+    process.env.WORKER_HOST_GATEWAY = '172.17.0.1'
+
+    expect(rewriteLocalhostToGateway('http://localhost:54321')).toBe('http://172.17.0.1:54321/')
+  })
+
+  it('leaves other hosts and invalid URLs unchanged', () => {
+    expect(rewriteLocalhostToGateway('https://abc.supabase.co/storage/v1/object/a.png'))
+      .toBe('https://abc.supabase.co/storage/v1/object/a.png')
+    expect(rewriteLocalhostToGateway('not a url')).toBe('not a url')
+  })
+})
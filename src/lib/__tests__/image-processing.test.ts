@@ -381,7 +381,7 @@ describe('ImageProcessingService', () => {
       await imageProcessingService.storeImageMetadata(processedImage);
 
       expect(mockSupabase.from).toHaveBeenCalledWith('ai_generated_images');
-      expect(mockSupabase.insert).toHaveBeenCalledWith({
+      expect(mockSupabase.insert).toHaveBeenCalledWith([{
         id: 'image-123',
         menu_item_id: 'menu-123',
         generation_job_id: 'job-456',
@@ -398,7 +398,7 @@ describe('ImageProcessingService', () => {
           sizes: processedImage.sizes,
           processingTimestamp: expect.any(Number)
         }
-      });
+      }]);
     });
 
     it('should handle database errors', async () => {
@@ -425,6 +425,53 @@ describe('ImageProcessingService', () => {
     });
   });
 
+  describe('storeImagesMetadata', () => {
+    const buildImage = (id: string) => ({
+      id,
+      originalUrl: `https://example.com/${id}.jpg`,
+      metadata: {
+        menuItemId: 'menu-123',
+        generationJobId: 'job-456',
+        originalPrompt: 'Test prompt',
+        aspectRatio: '1:1',
+        generatedAt: new Date()
+      },
+      sizes: { original: 1024, thumbnail: 512, mobile: 256, desktop: 1024 }
+    } as any);
+
+    it('should insert all images in a single call', async () => {
+      mockSupabase.insert.mockResolvedValue({ data: null, error: null });
+
+      await imageProcessingService.storeImagesMetadata([
+        buildImage('image-1'),
+        buildImage('image-2')
+      ]);
+
+      expect(mockSupabase.insert).toHaveBeenCalledTimes(1);
+      expect(mockSupabase.insert).toHaveBeenCalledWith([
+        expect.objectContaining({ id: 'image-1', original_url: 'https://example.com/image-1.jpg' }),
+        expect.objectContaining({ id: 'image-2', original_url: 'https://example.com/image-2.jpg' })
+      ]);
+    });
+
+    it('should skip the insert when there are no images', async () => {
+      await imageProcessingService.storeImagesMetadata([]);
+
+      expect(mockSupabase.insert).not.toHaveBeenCalled();
+    });
+
+    it('should handle database errors', async () => {
+      mockSupabase.insert.mockResolvedValue({
+        data: null,
+        error: { message: 'Database error' }
+      });
+
+      await expect(
+        imageProcessingService.storeImagesMetadata([buildImage('image-1')])
+      ).rejects.toThrow('Failed to store metadata: Database error');
+    });
+  });
+
   describe('Image optimization', () => {
     it('should optimize images within file size constraints', async () => {
       const mockBuffer = Buffer.from('large-image-data');
@@ -14,6 +14,7 @@
 import { Storage } from '@google-cloud/storage'
 import fs from 'node:fs'
 import { logger } from '@/lib/logger'
+import { isRunningInDocker, rewriteLocalhostToGateway } from '@/lib/docker-host'
 
 const BUCKET_NAME = 'gridmenu-dev-temp'
 const TTL_SECONDS = 300 // 5 minutes — enough for Replicate to fetch it
@@ -60,42 +61,6 @@ function isLocalUrl(url: string): boolean {
   return url.includes('localhost') || url.includes('127.0.0.1') || url.includes('host.docker.internal')
 }
 
-function resolveLocalFetchUrl(imageUrl: string): string {
-  try {
-    const url = new URL(imageUrl)
-
-    if (!isRunningInDocker()) {
-      return imageUrl
-    }
-
-    if (url.hostname !== 'localhost' && url.hostname !== '127.0.0.1') {
-      return imageUrl
-    }
-
-    url.hostname = process.env.WORKER_HOST_GATEWAY || 'host.docker.internal'
-    return url.toString()
-  } catch {
-    return imageUrl
-  }
-}
-
-function isRunningInDocker(): boolean {
-  if (process.env.RUNNING_IN_DOCKER === 'true') return true
-
-  try {
-    if (fs.existsSync('/.dockerenv')) return true
-  } catch {
-    // ignore
-  }
-
-  try {
-    const cgroup = fs.readFileSync('/proc/1/cgroup', 'utf8')
-    return /docker|containerd|kubepods/i.test(cgroup)
-  } catch {
-    return false
-  }
-}
-
 /**
  * If running locally and the URL is a localhost URL, upload the image to GCS
  * and return a public URL that external services can reach.
@@ -120,7 +85,7 @@ export async function resolvePublicImageUrl(imageUrl: string): Promise<{ url: st
     )
   }
 
-  const fetchUrl = resolveLocalFetchUrl(imageUrl)
+  const fetchUrl = isRunningInDocker() ? rewriteLocalhostToGateway(imageUrl) : imageUrl
 
   logger.info('[LocalImageProxy] Uploading local image to GCS for external provider access', {
     imageUrl,
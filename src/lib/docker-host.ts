@@ -0,0 +1,64 @@
+import fs from 'node:fs'
+
+/**
+ * Docker host helpers shared by the worker, the worker Supabase client and
+ * the local image proxy.
+ *
+ * Inside a container `localhost` is the container itself, so URLs pointing at
+ * the host (local Supabase on :54321, the Next app on :3000) must go through
+ * the host gateway instead.
+ */
+
+/**
+ * Rewrites a localhost/127.0.0.1 URL to the Docker host gateway
+ * (`WORKER_HOST_GATEWAY`, default `host.docker.internal`).
+ * Any other URL, or a string that is not a valid URL, is returned unchanged.
+ */
+export function rewriteLocalhostToGateway(inputUrl: string): string {
+  try {
+    const url = new URL(inputUrl)
+
+    // Only rewrite true localhost-style URLs.
+    if (url.hostname !== 'localhost' && url.hostname !== '127.0.0.1') {
+      return inputUrl
+    }
+
+    // In Docker Desktop, host.docker.internal is the host gateway (works with --add-host on Linux too).
+    url.hostname = process.env.WORKER_HOST_GATEWAY || 'host.docker.internal'
+    return url.toString()
+  } catch {
+    return inputUrl
+  }
+}
+
+// The container filesystem does not change under a running process, so the
+// probe below runs once instead of on every client/URL resolution.
+let dockerFilesystemProbe: boolean | undefined
+
+/**
+ * Whether this process is running inside a container.
+ * `RUNNING_IN_DOCKER=true` forces it; otherwise the filesystem is probed once.
+ */
+export function isRunningInDocker(): boolean {
+  if (process.env.RUNNING_IN_DOCKER === 'true') return true
+  if (dockerFilesystemProbe === undefined) {
+    dockerFilesystemProbe = probeDockerFilesystem()
+  }
+  return dockerFilesystemProbe
+}
+
+function probeDockerFilesystem(): boolean {
+  try {
+    // Commonly present in Docker containers.
+    if (fs.existsSync('/.dockerenv')) return true
+  } catch {
+    // ignore
+  }
+  try {
+    // Fallback heuristic for some container runtimes.
+    const cgroup = fs.readFileSync('/proc/1/cgroup', 'utf8')
+    return /docker|containerd|kubepods/i.test(cgroup)
+  } catch {
+    return false
+  }
+}
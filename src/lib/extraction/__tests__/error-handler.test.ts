@@ -306,6 +306,52 @@ describe('ExtractionErrorHandler', () => {
       expect(assessment.recommendations).toContain('Retake the photo with better lighting')
     })
 
+    it('should average confidences across categories, items and subcategories', () => {
+      const result = {
+        menu: {
+          categories: [
+            {
+              name: 'Drinks',
+              items: [{ name: 'Tea', price: 3, confidence: 0.6 }],
+              confidence: 1,
+              subcategories: [
+                {
+                  name: 'Hot',
+                  items: [
+                    { name: 'Coffee', price: 4, confidence: 0.4 },
+                    { name: 'Cocoa', price: 4 }
+                  ],
+                  confidence: 0.8
+                }
+              ]
+            }
+          ]
+        },
+        currency: 'USD',
+        uncertainItems: [],
+        superfluousText: []
+      } as unknown as ExtractionResult
+
+      const assessment = ExtractionErrorHandler.assessImageQuality(result)
+
+      // Subcategory entries without a confidence are skipped: (1 + 0.6 + 0.8 + 0.4) / 4
+      expect(assessment.overallConfidence).toBeCloseTo(0.7)
+    })
+
+    it('should report zero confidence for an empty menu', () => {
+      const result: ExtractionResult = {
+        menu: { categories: [] },
+        currency: 'USD',
+        uncertainItems: [],
+        superfluousText: []
+      }
+
+      const assessment = ExtractionErrorHandler.assessImageQuality(result)
+
+      expect(assessment.overallConfidence).toBe(0)
+      expect(assessment.quality).toBe('unacceptable')
+    })
+
     it('should flag high number of uncertain items', () => {
       const result: ExtractionResult = {
         menu: {
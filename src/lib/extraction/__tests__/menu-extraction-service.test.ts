@@ -394,6 +394,31 @@ describe('MenuExtractionService', () => {
     })
   })
 
+  describe('calculateImageHash', () => {
+    it('should hash a streamed body chunk by chunk', async () => {
+      const chunks = [Buffer.from('test-'), Buffer.from('image-'), Buffer.from('data')]
+      const arrayBuffer = jest.fn()
+      global.fetch = jest.fn().mockResolvedValue({
+        ok: true,
+        body: {
+          getReader: () => ({
+            read: jest.fn()
+              .mockResolvedValueOnce({ done: false, value: chunks[0] })
+              .mockResolvedValueOnce({ done: false, value: chunks[1] })
+              .mockResolvedValueOnce({ done: false, value: chunks[2] })
+              .mockResolvedValueOnce({ done: true, value: undefined })
+          })
+        },
+        arrayBuffer
+      }) as any
+
+      const hash = await (service as any).calculateImageHash('https://example.com/menu.jpg')
+
+      expect(hash).toBe(createHash('sha256').update('test-image-data').digest('hex'))
+      expect(arrayBuffer).not.toHaveBeenCalled()
+    })
+  })
+
   describe('getJobStatus', () => {
     it('should retrieve job status', async () => {
       const mockJobId = 'job-123'
@@ -433,6 +458,30 @@ describe('MenuExtractionService', () => {
     })
   })
 
+  describe('completeJob', () => {
+    it('should store null confidence for an empty menu', async () => {
+      mockSupabase.single.mockResolvedValueOnce({
+        data: {
+          id: 'job-123',
+          status: 'completed',
+          created_at: new Date().toISOString()
+        },
+        error: null
+      })
+
+      await (service as any).completeJob(
+        'job-123',
+        { menu: { categories: [] }, currency: 'USD', uncertainItems: [], superfluousText: [] },
+        1000,
+        { inputTokens: 0, outputTokens: 0, totalTokens: 0, estimatedCost: 0 }
+      )
+
+      expect(mockSupabase.update).toHaveBeenCalledWith(
+        expect.objectContaining({ confidence: null })
+      )
+    })
+  })
+
   describe('Token usage and cost calculation', () => {
     it('should calculate token usage correctly', async () => {
       const mockImageUrl = 'https://example.com/menu.jpg'
@@ -53,6 +53,11 @@ export interface ImageQualityAssessment {
   canProceed: boolean
 }
 
+interface ConfidenceTotals {
+  sum: number
+  count: number
+}
+
 // ============================================================================
 // Error Handler Class
 // ============================================================================
@@ -300,24 +305,26 @@ export class ExtractionErrorHandler {
    * Assess image quality based on confidence scores
    */
   static assessImageQuality(result: ExtractionResult): ImageQualityAssessment {
-    const confidences: number[] = []
+    const totals: ConfidenceTotals = { sum: 0, count: 0 }
     const issues: string[] = []
     const recommendations: string[] = []
 
-    // Collect all confidence scores
+    // Sum all confidence scores in a single pass (no intermediate array)
     result.menu.categories.forEach(cat => {
-      confidences.push(cat.confidence)
+      totals.sum += cat.confidence
+      totals.count++
       cat.items.forEach(item => {
-        confidences.push(item.confidence)
+        totals.sum += item.confidence
+        totals.count++
       })
       
       // Recursively check subcategories
-      this.collectConfidencesRecursive(cat.subcategories || [], confidences)
+      this.sumConfidencesRecursive(cat.subcategories || [], totals)
     })
 
     // Calculate overall confidence
-    const overallConfidence = confidences.length > 0
-      ? confidences.reduce((sum, c) => sum + c, 0) / confidences.length
+    const overallConfidence = totals.count > 0
+      ? totals.sum / totals.count
       : 0
 
     // Determine quality level
@@ -543,20 +550,22 @@ export class ExtractionErrorHandler {
     return summary
   }
 
-  private static collectConfidencesRecursive(categories: any[], confidences: number[]): void {
+  private static sumConfidencesRecursive(categories: any[], totals: ConfidenceTotals): void {
     categories.forEach(cat => {
       if (cat.confidence !== undefined) {
-        confidences.push(cat.confidence)
+        totals.sum += cat.confidence
+        totals.count++
       }
       if (cat.items) {
         cat.items.forEach((item: any) => {
           if (item.confidence !== undefined) {
-            confidences.push(item.confidence)
+            totals.sum += item.confidence
+            totals.count++
           }
         })
       }
       if (cat.subcategories) {
-        this.collectConfidencesRecursive(cat.subcategories, confidences)
+        this.sumConfidencesRecursive(cat.subcategories, totals)
       }
     })
   }
@@ -326,18 +326,17 @@ export class MenuExtractionService {
 
     // Stage 2 normalization (variants, modifier price deltas)
     if (promptPackage?.schemaVersion === 'stage2') {
-      console.log('Before normalization - full structure:', JSON.stringify({
+      // Log a structural summary rather than re-serializing every item; the
+      // full result is persisted on the job row anyway.
+      const categories = rawData?.menu?.categories
+      console.log('Before normalization - structure:', {
         hasMenu: !!rawData?.menu,
-        categoriesCount: rawData?.menu?.categories?.length || 0,
-        categories: rawData?.menu?.categories?.map((cat: any) => ({
-          name: cat.name,
-          itemsCount: cat.items?.length || 0,
-          items: cat.items
-        }))
-      }, null, 2))
-      console.log('Before normalization - sample item:', JSON.stringify(rawData?.menu?.categories?.[0]?.items?.[0], null, 2))
+        categoriesCount: categories?.length || 0,
+        itemsCount: categories?.reduce((count: number, cat: any) => count + (cat.items?.length || 0), 0) || 0
+      })
+      console.log('Before normalization - sample item:', JSON.stringify(categories?.[0]?.items?.[0]))
       rawData = this.normalizeStage2Extraction(rawData)
-      console.log('After normalization - sample item:', JSON.stringify(rawData?.menu?.categories?.[0]?.items?.[0], null, 2))
+      console.log('After normalization - sample item:', JSON.stringify(rawData?.menu?.categories?.[0]?.items?.[0]))
     }
 
     // Validate against schema (respect schema version from prompt)
@@ -351,7 +350,7 @@ export class MenuExtractionService {
       
       // Log a few sample items that might be failing
       const sampleItems = rawData?.menu?.categories?.flatMap((cat: any) => cat.items || []).slice(0, 3)
-      console.error('Sample items from raw data:', JSON.stringify(sampleItems, null, 2))
+      console.error('Sample items from raw data:', JSON.stringify(sampleItems))
       
       // Attempt to salvage partial data
       const validator = new SchemaValidator(promptPackage?.schemaVersion || 'stage1')
@@ -443,11 +442,20 @@ export class MenuExtractionService {
         }
       }
 
-      const arrayBuffer = await response.arrayBuffer()
-      const buffer = Buffer.from(arrayBuffer)
-      
       const hash = createHash('sha256')
-      hash.update(buffer)
+
+      // Feed chunks into the hash as they arrive instead of buffering the
+      // whole image first; menu photos can be several MB.
+      if (response.body) {
+        const reader = response.body.getReader()
+        for (;;) {
+          const { done, value } = await reader.read()
+          if (done) break
+          hash.update(value)
+        }
+      } else {
+        hash.update(Buffer.from(await response.arrayBuffer()))
+      }
       
       return hash.digest('hex')
     } catch (error) {
@@ -550,10 +558,12 @@ export class MenuExtractionService {
         result: result,
         processing_time: processingTime,
         token_usage: tokenUsage,
-        confidence: result.menu.categories.reduce(
-          (sum, cat) => sum + cat.confidence,
-          0
-        ) / result.menu.categories.length,
+        confidence: result.menu.categories.length > 0
+          ? result.menu.categories.reduce(
+              (sum, cat) => sum + cat.confidence,
+              0
+            ) / result.menu.categories.length
+          : null,
         uncertain_items: result.uncertainItems,
         superfluous_text: result.superfluousText,
         completed_at: new Date().toISOString()
@@ -2,7 +2,7 @@ import type { SupabaseClient } from '@supabase/supabase-js'
 import { CutoutGenerationService } from '@/lib/background-removal/cutout-service'
 import { isCutoutFeatureEnabled } from '@/lib/background-removal/feature-flag'
 import { getBackgroundRemovalProvider } from '@/lib/background-removal/provider-factory'
-import { ImageProcessingService } from '@/lib/image-processing'
+import { ImageProcessingService, type ProcessedImage } from '@/lib/image-processing'
 import { logger } from '@/lib/logger'
 import { syncMenuItemImageToJsonb } from '@/lib/menu-item-image-sync'
 import { getNanoBananaClient, NanoBananaError } from '@/lib/nano-banana'
@@ -77,7 +77,7 @@ export async function executeImageGenerationJob(
 
   try {
     const genResult = await getNanoBananaClient().generateImage(apiParams)
-    const imageIds: string[] = []
+    const processedImages: ProcessedImage[] = []
 
     for (const base64Image of genResult.images) {
       const processed = await imageProcessing.processGeneratedImage(
@@ -97,10 +97,13 @@ export async function executeImageGenerationJob(
         job.user_id
       )
 
-      await imageProcessing.storeImageMetadata(processed)
-      imageIds.push(processed.id)
+      processedImages.push(processed)
     }
 
+    // One insert for all variations instead of a round-trip per image
+    await imageProcessing.storeImagesMetadata(processedImages)
+    const imageIds = processedImages.map((processed) => processed.id)
+
     if (imageIds.length > 0) {
       const selectedImageId = imageIds[0]
 
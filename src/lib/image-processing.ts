@@ -404,38 +404,51 @@ export class ImageProcessingService {
    * Store processed image metadata in database
    */
   async storeImageMetadata(processedImage: ProcessedImage): Promise<void> {
+    await this.storeImagesMetadata([processedImage]);
+  }
+
+  /**
+   * Store metadata for several processed images with a single insert
+   */
+  async storeImagesMetadata(processedImages: ProcessedImage[]): Promise<void> {
+    if (processedImages.length === 0) return;
+
     try {
       const { error } = await this.supabase
         .from('ai_generated_images')
-        .insert({
-          id: processedImage.id,
-          menu_item_id: processedImage.metadata.menuItemId,
-          generation_job_id: processedImage.metadata.generationJobId,
-          original_url: processedImage.originalUrl,
-          thumbnail_url: processedImage.thumbnailUrl,
-          mobile_url: processedImage.mobileUrl,
-          desktop_url: processedImage.desktopUrl,
-          webp_url: processedImage.webpUrl,
-          prompt: processedImage.metadata.originalPrompt,
-          aspect_ratio: processedImage.metadata.aspectRatio,
-          file_size: processedImage.sizes.original,
-          selected: false,
-          metadata: {
-            ...processedImage.metadata.metadata,
-            sizes: processedImage.sizes,
-            processingTimestamp: Date.now()
-          }
-        });
+        .insert(processedImages.map((image) => this.toImageRow(image)));
 
       if (error) {
         console.error('Error storing image metadata:', error);
         throw new Error(`Failed to store metadata: ${error.message}`);
       }
     } catch (error) {
-      console.error('Error in storeImageMetadata:', error);
+      console.error('Error in storeImagesMetadata:', error);
       throw error;
     }
   }
+
+  private toImageRow(processedImage: ProcessedImage) {
+    return {
+      id: processedImage.id,
+      menu_item_id: processedImage.metadata.menuItemId,
+      generation_job_id: processedImage.metadata.generationJobId,
+      original_url: processedImage.originalUrl,
+      thumbnail_url: processedImage.thumbnailUrl,
+      mobile_url: processedImage.mobileUrl,
+      desktop_url: processedImage.desktopUrl,
+      webp_url: processedImage.webpUrl,
+      prompt: processedImage.metadata.originalPrompt,
+      aspect_ratio: processedImage.metadata.aspectRatio,
+      file_size: processedImage.sizes.original,
+      selected: false,
+      metadata: {
+        ...processedImage.metadata.metadata,
+        sizes: processedImage.sizes,
+        processingTimestamp: Date.now()
+      }
+    };
+  }
 }
 
 // Export singleton instance
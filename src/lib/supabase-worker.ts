@@ -1,5 +1,5 @@
 import { createClient } from '@supabase/supabase-js'
-import fs from 'node:fs'
+import { isRunningInDocker, rewriteLocalhostToGateway } from '@/lib/docker-host'
 
 /**
  * Direct Supabase client for Worker environments.
@@ -52,33 +52,3 @@ function resolveSupabaseUrl({ isDocker }: { isDocker: boolean }): string | undef
 
   return selected
 }
-
-function rewriteLocalhostToGateway(inputUrl: string): string {
-  try {
-    const url = new URL(inputUrl)
-    if (url.hostname !== 'localhost' && url.hostname !== '127.0.0.1') {
-      return inputUrl
-    }
-    url.hostname = process.env.WORKER_HOST_GATEWAY || 'host.docker.internal'
-    return url.toString()
-  } catch {
-    return inputUrl
-  }
-}
-
-function isRunningInDocker(): boolean {
-  if (process.env.RUNNING_IN_DOCKER === 'true') return true
-  try {
-    // Commonly present in Docker containers.
-    if (fs.existsSync('/.dockerenv')) return true
-  } catch {
-    // ignore
-  }
-  try {
-    // Fallback heuristic for some container runtimes.
-    const cgroup = fs.readFileSync('/proc/1/cgroup', 'utf8')
-    return /docker|containerd|kubepods/i.test(cgroup)
-  } catch {
-    return false
-  }
-}
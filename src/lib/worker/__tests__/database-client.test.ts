@@ -2,7 +2,15 @@
  * Unit tests for database client
  */
 
-import { databaseClient, initializeDatabaseClient } from '../database-client'
+import {
+  databaseClient,
+  initializeDatabaseClient,
+  createTimeoutFetch,
+  subscribeToQueueInserts,
+  resetJobToPendingWithBackoff,
+  resetImageGenerationJobToQueuedWithBackoff,
+  resetStudioExportVariantToQueuedWithBackoff,
+} from '../database-client'
 
 describe('DatabaseClient', () => {
   // Store original env vars
@@ -252,4 +260,171 @@ describe('DatabaseClient', () => {
       expect(() => databaseClient.getClient()).toThrow()
     })
   })
+
+  describe('createTimeoutFetch', () => {
+    // Never resolves on its own; rejects with the signal's reason on abort
+    const hangingFetch = jest.fn((_input: any, init?: RequestInit) =>
+      new Promise<Response>((_resolve, reject) => {
+        init?.signal?.addEventListener('abort', () => reject(init.signal!.reason))
+      })
+    ) as unknown as typeof fetch
+
+    it('should pass through responses that arrive in time', async () => {
+      const response = { ok: true } as Response
+      const fetchImpl = jest.fn().mockResolvedValue(response)
+
+      const timedFetch = createTimeoutFetch(1000, fetchImpl)
+
+      await expect(timedFetch('https://test.supabase.co/rest/v1/export_jobs')).resolves.toBe(response)
+      expect(fetchImpl).toHaveBeenCalledWith(
+        'https://test.supabase.co/rest/v1/export_jobs',
+        expect.objectContaining({ signal: expect.any(Object) })
+      )
+    })
+
+    it('should abort requests that exceed the timeout', async () => {
+      const timedFetch = createTimeoutFetch(10, hangingFetch)
+
+      await expect(timedFetch('https://test.supabase.co/rest/v1/export_jobs')).rejects.toThrow(
+        'Database request timed out after 10ms'
+      )
+    })
+
+    it.each([
+      'claim_menu_extraction_jobs',
+      'requeue_export_job_with_backoff',
+    ])('should not time out the non-idempotent %s RPC', async (rpcName) => {
+      const response = { ok: true } as Response
+      const slowFetch = jest.fn(
+        () => new Promise<Response>((resolve) => setTimeout(() => resolve(response), 30))
+      ) as unknown as typeof fetch
+      const timedFetch = createTimeoutFetch(10, slowFetch)
+
+      await expect(
+        timedFetch(`https://test.supabase.co/rest/v1/rpc/${rpcName}`, { method: 'POST' })
+      ).resolves.toBe(response)
+    })
+
+    it('should honour a caller-supplied abort signal', async () => {
+      const controller = new AbortController()
+      const timedFetch = createTimeoutFetch(1000, hangingFetch)
+
+      const request = timedFetch('https://test.supabase.co/rest/v1/export_jobs', {
+        signal: controller.signal,
+      })
+      controller.abort(new Error('cancelled'))
+
+      await expect(request).rejects.toThrow('cancelled')
+    })
+  })
+
+  describe('subscribeToQueueInserts', () => {
+    it('should report channel statuses other than SUBSCRIBED', () => {
+      databaseClient.initialize({
+        supabaseUrl: 'https://test.supabase.co',
+        supabaseServiceRoleKey: 'test-service-role-key',
+      })
+
+      let onStatus: (status: string, error?: Error) => void = () => {}
+      const channel: any = {
+        on: jest.fn(() => channel),
+        subscribe: jest.fn((callback) => {
+          onStatus = callback
+          return channel
+        }),
+      }
+      jest.spyOn(databaseClient.getClient(), 'channel').mockReturnValue(channel)
+
+      const onUnavailable = jest.fn()
+      subscribeToQueueInserts(jest.fn(), onUnavailable)
+
+      onStatus('SUBSCRIBED')
+      expect(onUnavailable).not.toHaveBeenCalled()
+
+      const error = new Error('socket closed')
+      onStatus('CHANNEL_ERROR', error)
+      onStatus('TIMED_OUT')
+      expect(onUnavailable).toHaveBeenCalledWith('CHANNEL_ERROR', error)
+      expect(onUnavailable).toHaveBeenCalledWith('TIMED_OUT', undefined)
+    })
+
+    it('should not report the CLOSED status caused by unsubscribing', async () => {
+      databaseClient.initialize({
+        supabaseUrl: 'https://test.supabase.co',
+        supabaseServiceRoleKey: 'test-service-role-key',
+      })
+
+      let onStatus: (status: string, error?: Error) => void = () => {}
+      const channel: any = {
+        on: jest.fn(() => channel),
+        subscribe: jest.fn((callback) => {
+          onStatus = callback
+          return channel
+        }),
+      }
+      const client = databaseClient.getClient()
+      jest.spyOn(client, 'channel').mockReturnValue(channel)
+
+      const onUnavailable = jest.fn()
+      const unsubscribe = subscribeToQueueInserts(jest.fn(), onUnavailable)
+
+      // A server-side close is still reported
+      onStatus('CLOSED')
+      expect(onUnavailable).toHaveBeenCalledWith('CLOSED', undefined)
+      onUnavailable.mockClear()
+
+      jest.spyOn(client, 'removeChannel').mockImplementation(async () => {
+        onStatus('CLOSED')
+        return 'ok'
+      })
+      await unsubscribe()
+
+      expect(onUnavailable).not.toHaveBeenCalled()
+    })
+  })
+
+  describe('requeue with backoff', () => {
+    let rpc: jest.SpyInstance
+
+    beforeEach(() => {
+      databaseClient.initialize({
+        supabaseUrl: 'https://test.supabase.co',
+        supabaseServiceRoleKey: 'test-service-role-key',
+      })
+      rpc = jest.spyOn(databaseClient.getClient(), 'rpc').mockResolvedValue({ data: null, error: null } as any)
+    })
+
+    it('should requeue an export job in one RPC', async () => {
+      await resetJobToPendingWithBackoff('job-1', 30, 'Render timed out')
+
+      expect(rpc).toHaveBeenCalledTimes(1)
+      expect(rpc).toHaveBeenCalledWith('requeue_export_job_with_backoff', {
+        p_job_id: 'job-1',
+        p_retry_delay_seconds: 30,
+        p_error_message: 'Render timed out',
+      })
+    })
+
+    it('should requeue an image generation job in one RPC', async () => {
+      await resetImageGenerationJobToQueuedWithBackoff('job-2', 60, 'Provider busy')
+
+      expect(rpc).toHaveBeenCalledTimes(1)
+      expect(rpc).toHaveBeenCalledWith('requeue_image_generation_job_with_backoff', {
+        p_job_id: 'job-2',
+        p_retry_delay_seconds: 60,
+        p_error_message: 'Provider busy',
+      })
+    })
+
+    it('should requeue a studio export variant in one RPC', async () => {
+      await resetStudioExportVariantToQueuedWithBackoff('variant-3', 120, 'Upload failed')
+
+      expect(rpc).toHaveBeenCalledTimes(1)
+      expect(rpc).toHaveBeenCalledWith('requeue_studio_export_variant_with_backoff', {
+        p_variant_id: 'variant-3',
+        p_retry_delay_seconds: 120,
+        p_error_message: 'Upload failed',
+      })
+    })
+  })
 })
@@ -11,11 +11,13 @@
 import { JobPoller } from '../job-poller'
 import { JobProcessor } from '../job-processor'
 import * as databaseClient from '../database-client'
-import type { ExportJob } from '../database-client'
+import type { ExportJob, ExtractionJob, ImageGenerationJob } from '../database-client'
+import { logWarning } from '../logger'
 
 // Mock dependencies
 jest.mock('../database-client')
 jest.mock('../job-processor')
+jest.mock('../logger')
 
 describe('JobPoller', () => {
   let poller: JobPoller
@@ -29,6 +31,8 @@ describe('JobPoller', () => {
     // Create mock processor
     mockProcessor = {
       process: jest.fn().mockResolvedValue(undefined),
+      processExtraction: jest.fn().mockResolvedValue(undefined),
+      processImageGeneration: jest.fn().mockResolvedValue(undefined),
       shutdown: jest.fn().mockResolvedValue(undefined),
     } as any
 
@@ -337,4 +341,321 @@ describe('JobPoller', () => {
       expect(mockProcessor.process).toHaveBeenCalledTimes(2)
     })
   })
+  describe('enqueue notifications', () => {
+    it('should poll immediately when a job is enqueued while idle', async () => {
+      let onEnqueue: (table: string) => void = () => {}
+      const unsubscribe = jest.fn().mockResolvedValue(undefined)
+      jest.spyOn(databaseClient, 'subscribeToQueueInserts').mockImplementation((callback) => {
+        onEnqueue = callback
+        return unsubscribe
+      })
+
+      const mockClaimJob = jest.spyOn(databaseClient, 'claimJob')
+      mockClaimJob.mockResolvedValue(null)
+
+      const mockGetQueueDepth = jest.spyOn(databaseClient, 'getQueueDepth')
+      mockGetQueueDepth.mockResolvedValue(0)
+
+      await poller.start()
+      expect(mockClaimJob).toHaveBeenCalledTimes(1)
+
+      // No timers advanced: the notification alone triggers the next poll
+      onEnqueue('export_jobs')
+      for (let i = 0; i < 50; i++) {
+        await Promise.resolve()
+      }
+      expect(mockClaimJob).toHaveBeenCalledTimes(2)
+
+      await poller.stop()
+      expect(unsubscribe).toHaveBeenCalled()
+    })
+
+    it('should coalesce notifications received mid-poll into one follow-up poll', async () => {
+      let onEnqueue: (table: string) => void = () => {}
+      jest.spyOn(databaseClient, 'subscribeToQueueInserts').mockImplementation((callback) => {
+        onEnqueue = callback
+        return jest.fn().mockResolvedValue(undefined)
+      })
+
+      let finishFirstClaim: (job: null) => void = () => {}
+      const mockClaimJob = jest.spyOn(databaseClient, 'claimJob')
+      mockClaimJob
+        .mockImplementationOnce(() => new Promise((resolve) => { finishFirstClaim = resolve }))
+        .mockResolvedValue(null)
+
+      const mockGetQueueDepth = jest.spyOn(databaseClient, 'getQueueDepth')
+      mockGetQueueDepth.mockResolvedValue(0)
+
+      const started = poller.start()
+      for (let i = 0; i < 50; i++) {
+        await Promise.resolve()
+      }
+      expect(mockClaimJob).toHaveBeenCalledTimes(1)
+
+      // A burst arrives while the first poll is still claiming
+      onEnqueue('export_jobs')
+      onEnqueue('export_jobs')
+      onEnqueue('menu_extraction_jobs')
+
+      finishFirstClaim(null)
+      await started
+      for (let i = 0; i < 50; i++) {
+        await Promise.resolve()
+      }
+
+      // One extra poll without waiting for the interval, not one per insert
+      expect(mockClaimJob).toHaveBeenCalledTimes(2)
+    })
+
+    it('should fall back to polling if the subscription fails', async () => {
+      jest.spyOn(databaseClient, 'subscribeToQueueInserts').mockImplementation((_onEnqueue, onUnavailable) => {
+        onUnavailable?.('CHANNEL_ERROR', new Error('realtime unavailable'))
+        return jest.fn().mockResolvedValue(undefined)
+      })
+
+      const mockClaimJob = jest.spyOn(databaseClient, 'claimJob')
+      mockClaimJob.mockResolvedValue(null)
+
+      const mockGetQueueDepth = jest.spyOn(databaseClient, 'getQueueDepth')
+      mockGetQueueDepth.mockResolvedValue(0)
+
+      await poller.start()
+      await jest.runOnlyPendingTimersAsync()
+
+      expect(logWarning).toHaveBeenCalledWith(
+        'Queue notifications unavailable, relying on polling',
+        expect.objectContaining({ status: 'CHANNEL_ERROR', error: 'realtime unavailable' })
+      )
+      expect(mockClaimJob.mock.calls.length).toBeGreaterThan(1)
+    })
+  })
+
+  describe('extraction job claims', () => {
+    const makeExtractionJob = (id: string): ExtractionJob => ({
+      id,
+      user_id: 'user-1',
+      menu_id: 'menu-1',
+      image_url: 'https://example.com/menu.jpg',
+      image_hash: 'hash',
+      status: 'processing',
+      schema_version: 'stage2',
+      prompt_version: 'v2.0',
+      retry_count: 0,
+      priority: 0,
+      worker_id: workerId,
+      available_at: new Date().toISOString(),
+      created_at: new Date().toISOString(),
+      updated_at: new Date().toISOString(),
+      started_at: new Date().toISOString(),
+      completed_at: null,
+    })
+
+    it('should claim only one job at a time by default', async () => {
+      const job1 = makeExtractionJob('ext-1')
+      const job2 = makeExtractionJob('ext-2')
+
+      const mockClaimExtractionJobs = jest.spyOn(databaseClient, 'claimExtractionJobs')
+      mockClaimExtractionJobs
+        .mockResolvedValueOnce([job1])
+        .mockResolvedValueOnce([job2])
+        .mockResolvedValue([])
+
+      const mockGetQueueDepth = jest.spyOn(databaseClient, 'getQueueDepth')
+      mockGetQueueDepth.mockResolvedValue(0)
+
+      await poller.start()
+      await jest.runOnlyPendingTimersAsync()
+
+      expect(mockProcessor.processExtraction).toHaveBeenNthCalledWith(1, job1)
+      expect(mockProcessor.processExtraction).toHaveBeenNthCalledWith(2, job2)
+
+      // job2 is claimed only after job1 has run, never held while it waits
+      expect(mockClaimExtractionJobs).toHaveBeenCalledWith(workerId, 1)
+      const job1Order = mockProcessor.processExtraction.mock.invocationCallOrder[0]
+      const secondClaimOrder = mockClaimExtractionJobs.mock.invocationCallOrder[1]
+      expect(job1Order).toBeLessThan(secondClaimOrder)
+    })
+
+    it('should run up to extractionConcurrency jobs at once', async () => {
+      const job1 = makeExtractionJob('ext-1')
+      const job2 = makeExtractionJob('ext-2')
+
+      jest.spyOn(databaseClient, 'claimExtractionJobs')
+        .mockResolvedValueOnce([job1, job2])
+        .mockResolvedValue([])
+      jest.spyOn(databaseClient, 'getQueueDepth').mockResolvedValue(0)
+
+      const finishers: Array<() => void> = []
+      mockProcessor.processExtraction.mockImplementation(
+        () => new Promise<void>((resolve) => { finishers.push(resolve) })
+      )
+
+      const concurrentPoller = new JobPoller({
+        processor: mockProcessor,
+        workerId,
+        pollingIntervalBusyMs: 100,
+        pollingIntervalIdleMs: 200,
+        extractionConcurrency: 2,
+      })
+
+      void concurrentPoller.start()
+      for (let i = 0; i < 50; i++) {
+        await Promise.resolve()
+      }
+
+      // Both jobs started before either finished
+      expect(mockProcessor.processExtraction).toHaveBeenCalledWith(job1)
+      expect(mockProcessor.processExtraction).toHaveBeenCalledWith(job2)
+
+      finishers.forEach((finish) => finish())
+      await concurrentPoller.stop()
+      mockProcessor.processExtraction.mockResolvedValue(undefined)
+    })
+
+    it('should fall back to the default concurrency for an unparsable setting', async () => {
+      const job1 = makeExtractionJob('ext-1')
+
+      jest.spyOn(databaseClient, 'claimExtractionJobs')
+        .mockResolvedValueOnce([job1])
+        .mockResolvedValue([])
+      jest.spyOn(databaseClient, 'getQueueDepth').mockResolvedValue(0)
+
+      // parseInt('two', 10) in loadConfig
+      const misconfiguredPoller = new JobPoller({
+        processor: mockProcessor,
+        workerId,
+        pollingIntervalBusyMs: 100,
+        pollingIntervalIdleMs: 200,
+        extractionConcurrency: NaN,
+      })
+
+      await misconfiguredPoller.start()
+
+      expect(mockProcessor.processExtraction).toHaveBeenCalledWith(job1)
+
+      await misconfiguredPoller.stop()
+    })
+
+    it('should wait for an in-flight claim on stop and release it', async () => {
+      const job1 = makeExtractionJob('ext-1')
+
+      let finishClaim: (jobs: ExtractionJob[]) => void = () => {}
+      jest.spyOn(databaseClient, 'claimExtractionJobs').mockImplementationOnce(
+        () => new Promise((resolve) => { finishClaim = resolve })
+      )
+      const mockRelease = jest.spyOn(databaseClient, 'releaseExtractionJobs')
+      mockRelease.mockResolvedValue(1)
+
+      const started = poller.start()
+      for (let i = 0; i < 50; i++) {
+        await Promise.resolve()
+      }
+
+      let stopResolved = false
+      const stopped = poller.stop().then(() => { stopResolved = true })
+      for (let i = 0; i < 50; i++) {
+        await Promise.resolve()
+      }
+
+      // Shutdown must not continue while the claim is still on the wire
+      expect(stopResolved).toBe(false)
+
+      finishClaim([job1])
+      await stopped
+
+      expect(mockRelease).toHaveBeenCalledWith(['ext-1'], workerId)
+      expect(mockProcessor.processExtraction).not.toHaveBeenCalled()
+      await started
+    })
+  })
+
+  describe('image generation job claims', () => {
+    const makeImageGenerationJob = (id: string): ImageGenerationJob => ({
+      id,
+      user_id: 'user-1',
+      menu_id: 'menu-1',
+      menu_item_id: `item-${id}`,
+      batch_id: 'batch-1',
+      status: 'processing',
+      prompt: 'A plated burger',
+      negative_prompt: null,
+      api_params: {},
+      number_of_variations: 1,
+      result_count: 0,
+      error_message: null,
+      error_code: null,
+      processing_time: null,
+      estimated_cost: 1,
+      retry_count: 0,
+      priority: 10,
+      worker_id: workerId,
+      available_at: new Date().toISOString(),
+      created_at: new Date().toISOString(),
+      updated_at: new Date().toISOString(),
+      started_at: new Date().toISOString(),
+      completed_at: null,
+    })
+
+    it('should claim only one job at a time by default', async () => {
+      const job1 = makeImageGenerationJob('img-1')
+      const job2 = makeImageGenerationJob('img-2')
+
+      const mockClaimImageGenerationJobs = jest.spyOn(databaseClient, 'claimImageGenerationJobs')
+      mockClaimImageGenerationJobs
+        .mockResolvedValueOnce([job1])
+        .mockResolvedValueOnce([job2])
+        .mockResolvedValue([])
+
+      const mockGetQueueDepth = jest.spyOn(databaseClient, 'getQueueDepth')
+      mockGetQueueDepth.mockResolvedValue(0)
+
+      await poller.start()
+      await jest.runOnlyPendingTimersAsync()
+
+      expect(mockProcessor.processImageGeneration).toHaveBeenNthCalledWith(1, job1)
+      expect(mockProcessor.processImageGeneration).toHaveBeenNthCalledWith(2, job2)
+
+      // job2 is claimed only after job1 has run, never held while it waits
+      expect(mockClaimImageGenerationJobs).toHaveBeenCalledWith(workerId, 1)
+      const job1Order = mockProcessor.processImageGeneration.mock.invocationCallOrder[0]
+      const secondClaimOrder = mockClaimImageGenerationJobs.mock.invocationCallOrder[1]
+      expect(job1Order).toBeLessThan(secondClaimOrder)
+    })
+
+    it('should start every claimed job at once', async () => {
+      const job1 = makeImageGenerationJob('img-1')
+      const job2 = makeImageGenerationJob('img-2')
+
+      const mockClaimImageGenerationJobs = jest.spyOn(databaseClient, 'claimImageGenerationJobs')
+      mockClaimImageGenerationJobs.mockResolvedValueOnce([job1, job2]).mockResolvedValue([])
+      jest.spyOn(databaseClient, 'getQueueDepth').mockResolvedValue(0)
+
+      const finishers: Array<() => void> = []
+      mockProcessor.processImageGeneration.mockImplementation(
+        () => new Promise<void>((resolve) => { finishers.push(resolve) })
+      )
+
+      const concurrentPoller = new JobPoller({
+        processor: mockProcessor,
+        workerId,
+        pollingIntervalBusyMs: 100,
+        pollingIntervalIdleMs: 200,
+        imageGenerationConcurrency: 2,
+      })
+
+      void concurrentPoller.start()
+      for (let i = 0; i < 50; i++) {
+        await Promise.resolve()
+      }
+
+      // Both jobs started before either finished
+      expect(mockClaimImageGenerationJobs).toHaveBeenCalledWith(workerId, 2)
+      expect(mockProcessor.processImageGeneration).toHaveBeenCalledWith(job1)
+      expect(mockProcessor.processImageGeneration).toHaveBeenCalledWith(job2)
+
+      finishers.forEach((finish) => finish())
+      await concurrentPoller.stop()
+      mockProcessor.processImageGeneration.mockResolvedValue(undefined)
+    })
+  })
 })
@@ -145,6 +145,29 @@ describe('JobProcessor Extraction', () => {
       )
     })
 
+    it('should reuse the extraction service across jobs', async () => {
+      // Arrange
+      const job: any = {
+        id: 'job-123',
+        menu_id: null,
+        image_url: 'https://example.com/image.jpg',
+        schema_version: 'stage2',
+        prompt_version: 'v2.0',
+      }
+      mockExtractionService.processWithVisionLLM.mockResolvedValue({
+        extractionResult: { menu: { categories: [] } },
+        usage: { total_tokens: 100 },
+      })
+
+      // Act
+      await processor.processExtraction(job)
+      await processor.processExtraction({ ...job, id: 'job-456' })
+
+      // Assert
+      expect(createMenuExtractionService).toHaveBeenCalledTimes(1)
+      expect(updateExtractionJobToCompleted).toHaveBeenCalledTimes(2)
+    })
+
     it('should fail if OPENAI_API_KEY is missing', async () => {
       // Arrange
       delete process.env.OPENAI_API_KEY
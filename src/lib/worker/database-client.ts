@@ -12,7 +12,7 @@
 
 import { createClient, SupabaseClient } from '@supabase/supabase-js'
 import type { Database } from '../../types/database'
-import fs from 'node:fs'
+import { isRunningInDocker, rewriteLocalhostToGateway } from '../docker-host'
 
 /**
  * Configuration for database client
@@ -83,6 +83,10 @@ class DatabaseClient {
             headers: {
               'x-worker-client': 'railway-export-worker',
             },
+            // Bound the wait for response headers so a stalled connection
+            // can't hang the poll loop. Claim and requeue RPCs are exempt:
+            // they are not safe to abort and retry once committed.
+            fetch: createTimeoutFetch(finalConfig.connectionTimeout),
           },
         }
       )
@@ -271,6 +275,63 @@ export function initializeDatabaseClient(): void {
   })
 }
 
+/**
+ * RPCs that are not idempotent, so an abort after the server committed is
+ * unsafe. They can commit while their response is slow:
+ * - claim_* (claim_export_job, claim_menu_extraction_jobs, ...): aborting
+ *   drops the claimed rows, which then sit in 'processing' under this
+ *   worker_id with nothing to recover them.
+ * - requeue_*_with_backoff (migration 083): each call increments retry_count
+ *   in place, so withRetry re-running an aborted call would burn two retries.
+ */
+const NON_IDEMPOTENT_RPC_PATTERN = /\/rest\/v1\/rpc\/(claim_|requeue_)/
+
+/**
+ * Wrap fetch so a request is aborted if no response arrives within timeoutMs
+ *
+ * A caller-supplied signal is still honoured. The timer only covers waiting
+ * for the response headers, not reading the body. Claim and requeue RPCs are
+ * passed through without a timeout (see NON_IDEMPOTENT_RPC_PATTERN).
+ *
+ * @param timeoutMs - Maximum time to wait for a response
+ * @param fetchImpl - Underlying fetch (defaults to the global fetch)
+ */
+export function createTimeoutFetch(
+  timeoutMs: number,
+  fetchImpl: typeof fetch = (...args) => fetch(...args)
+): typeof fetch {
+  return async (input, init = {}) => {
+    const url = typeof input === 'string'
+      ? input
+      : input instanceof URL ? input.href : input.url
+    if (NON_IDEMPOTENT_RPC_PATTERN.test(url)) {
+      return fetchImpl(input, init)
+    }
+
+    const controller = new AbortController()
+    const timer = setTimeout(() => {
+      controller.abort(new Error(`Database request timed out after ${timeoutMs}ms`))
+    }, timeoutMs)
+
+    const callerSignal = init.signal
+    const forwardAbort = () => controller.abort(callerSignal?.reason)
+    if (callerSignal) {
+      if (callerSignal.aborted) {
+        forwardAbort()
+      } else {
+        callerSignal.addEventListener('abort', forwardAbort, { once: true })
+      }
+    }
+
+    try {
+      return await fetchImpl(input, { ...init, signal: controller.signal })
+    } finally {
+      clearTimeout(timer)
+      callerSignal?.removeEventListener('abort', forwardAbort)
+    }
+  }
+}
+
 export function resolveSupabaseUrlForWorker(): string | undefined {
   const isDocker = isRunningInDocker()
 
@@ -292,34 +353,6 @@ export function resolveSupabaseUrlForWorker(): string | undefined {
   return selected
 }
 
-function rewriteLocalhostToGateway(inputUrl: string): string {
-  try {
-    const url = new URL(inputUrl)
-    if (url.hostname !== 'localhost' && url.hostname !== '127.0.0.1') {
-      return inputUrl
-    }
-    url.hostname = process.env.WORKER_HOST_GATEWAY || 'host.docker.internal'
-    return url.toString()
-  } catch {
-    return inputUrl
-  }
-}
-
-function isRunningInDocker(): boolean {
-  if (process.env.RUNNING_IN_DOCKER === 'true') return true
-  try {
-    if (fs.existsSync('/.dockerenv')) return true
-  } catch {
-    // ignore
-  }
-  try {
-    const cgroup = fs.readFileSync('/proc/1/cgroup', 'utf8')
-    return /docker|containerd|kubepods/i.test(cgroup)
-  } catch {
-    return false
-  }
-}
-
 /**
  * Export job type from database
  */
@@ -423,25 +456,66 @@ export async function claimJob(workerId: string): Promise<ExportJob | null> {
 }
 
 /**
- * Atomic image generation job claiming
+ * Atomically claim up to `batchSize` image generation jobs in one round-trip
  *
- * @param workerId - Unique identifier for the worker claiming the job
- * @returns Claimed image generation job or null if no jobs available
+ * @param workerId - Unique identifier for the worker claiming the jobs
+ * @param batchSize - Maximum number of jobs to claim
+ * @returns Claimed jobs in queue order (empty if none available)
  */
-export async function claimImageGenerationJob(workerId: string): Promise<ImageGenerationJob | null> {
+export async function claimImageGenerationJobs(
+  workerId: string,
+  batchSize: number
+): Promise<ImageGenerationJob[]> {
   return databaseClient.withRetry(async () => {
     const client = databaseClient.getClient()
 
-    const { data, error } = await client.rpc('claim_image_generation_job', {
-      p_worker_id: workerId
+    const { data, error } = await client.rpc('claim_image_generation_jobs', {
+      p_worker_id: workerId,
+      p_batch_size: batchSize,
     }) as { data: ImageGenerationJob[] | null; error: any }
 
     if (error) {
-      throw new Error(`Failed to claim image generation job: ${error.message}`)
+      throw new Error(`Failed to claim image generation jobs: ${error.message}`)
     }
 
-    return data && data.length > 0 ? data[0] : null
-  }, 'claimImageGenerationJob')
+    return data ?? []
+  }, 'claimImageGenerationJobs')
+}
+
+/**
+ * Return claimed-but-unstarted image generation jobs to the queue
+ *
+ * @param jobIds - IDs of jobs this worker claimed but did not start
+ * @param workerId - Worker that holds the claim
+ * @returns Number of jobs released
+ */
+export async function releaseImageGenerationJobs(
+  jobIds: string[],
+  workerId: string
+): Promise<number> {
+  if (jobIds.length === 0) return 0
+  return databaseClient.withRetry(async () => {
+    const client = databaseClient.getClient()
+
+    const { data, error } = await client
+      .from('image_generation_jobs')
+      .update({
+        status: 'queued' as const,
+        worker_id: null,
+        started_at: null,
+        updated_at: new Date().toISOString(),
+      } as any)
+      .in('id', jobIds)
+      .eq('worker_id', workerId)
+      .eq('status', 'processing')
+      .select('id') as { data: { id: string }[] | null; error: any }
+
+    if (error) {
+      throw new Error(`Failed to release image generation jobs: ${error.message}`)
+    }
+
+    return data?.length || 0
+  }, 'releaseImageGenerationJobs')
 }
 
 /**
@@ -546,30 +620,13 @@ export async function resetStudioExportVariantToQueuedWithBackoff(
   return databaseClient.withRetry(async () => {
     const client = databaseClient.getClient()
 
-    const { data: current, error: fetchError } = await client
-      .from('studio_export_variants')
-      .select('retry_count')
-      .eq('id', variantId)
-      .single()
-
-    if (fetchError) {
-      throw new Error(`Failed to read studio export retry count: ${fetchError.message}`)
-    }
-
-    const availableAt = new Date(Date.now() + retryDelaySeconds * 1000).toISOString()
-
-    const { error } = await client
-      .from('studio_export_variants')
-      .update({
-        status: 'queued',
-        retry_count: ((current?.retry_count as number) ?? 0) + 1,
-        error_message: errorMessage.slice(0, 500),
-        worker_id: null,
-        started_at: null,
-        available_at: availableAt,
-        updated_at: new Date().toISOString(),
-      })
-      .eq('id', variantId)
+    // Single atomic UPDATE: retry_count is incremented server-side (migration 083)
+    // @ts-ignore - RPC function not in generated types yet
+    const { error } = await client.rpc('requeue_studio_export_variant_with_backoff', {
+      p_variant_id: variantId,
+      p_retry_delay_seconds: retryDelaySeconds,
+      p_error_message: errorMessage,
+    })
 
     if (error) {
       throw new Error(`Failed to requeue studio export variant: ${error.message}`)
@@ -631,28 +688,69 @@ export interface ExtractionJob {
 }
 
 /**
- * Atomic extraction job claiming
- * 
- * @param workerId - Unique identifier for the worker claiming the job
- * @returns Claimed extraction job or null if no jobs available
+ * Atomically claim up to `batchSize` extraction jobs in one round-trip
+ *
+ * @param workerId - Unique identifier for the worker claiming the jobs
+ * @param batchSize - Maximum number of jobs to claim
+ * @returns Claimed jobs in queue order (empty if none available)
  */
-export async function claimExtractionJob(workerId: string): Promise<ExtractionJob | null> {
+export async function claimExtractionJobs(
+  workerId: string,
+  batchSize: number
+): Promise<ExtractionJob[]> {
   return databaseClient.withRetry(async () => {
     const client = databaseClient.getClient()
-    
-    // Use RPC to execute atomic claim in a single transaction
-    // @ts-ignore - RPC function not in generated types yet
-    const { data, error } = await client.rpc('claim_menu_extraction_job', {
-      p_worker_id: workerId
+
+    const { data, error } = await client.rpc('claim_menu_extraction_jobs', {
+      p_worker_id: workerId,
+      p_batch_size: batchSize,
     }) as { data: ExtractionJob[] | null; error: any }
 
     if (error) {
-      throw new Error(`Failed to claim extraction job: ${error.message}`)
+      throw new Error(`Failed to claim extraction jobs: ${error.message}`)
     }
 
-    // RPC returns array, get first result or null
-    return data && data.length > 0 ? data[0] : null
-  }, 'claimExtractionJob')
+    return data ?? []
+  }, 'claimExtractionJobs')
+}
+
+/**
+ * Return claimed-but-unstarted extraction jobs to the queue
+ *
+ * Used on shutdown so jobs whose claim returned after the poller stopped are
+ * picked up by another worker instead of sitting in 'processing'.
+ *
+ * @param jobIds - IDs of jobs this worker claimed but did not start
+ * @param workerId - Worker that holds the claim
+ * @returns Number of jobs released
+ */
+export async function releaseExtractionJobs(
+  jobIds: string[],
+  workerId: string
+): Promise<number> {
+  if (jobIds.length === 0) return 0
+  return databaseClient.withRetry(async () => {
+    const client = databaseClient.getClient()
+
+    const { data, error } = await client
+      .from('menu_extraction_jobs')
+      .update({
+        status: 'queued' as const,
+        worker_id: null,
+        started_at: null,
+        updated_at: new Date().toISOString(),
+      } as any)
+      .in('id', jobIds)
+      .eq('worker_id', workerId)
+      .eq('status', 'processing')
+      .select('id') as { data: { id: string }[] | null; error: any }
+
+    if (error) {
+      throw new Error(`Failed to release extraction jobs: ${error.message}`)
+    }
+
+    return data?.length || 0
+  }, 'releaseExtractionJobs')
 }
 
 /**
@@ -784,30 +882,13 @@ export async function resetImageGenerationJobToQueuedWithBackoff(
   return databaseClient.withRetry(async () => {
     const client = databaseClient.getClient()
 
-    const { data: currentJob, error: fetchError } = await client
-      .from('image_generation_jobs')
-      .select('retry_count')
-      .eq('id', jobId)
-      .single() as { data: { retry_count: number } | null; error: any }
-
-    if (fetchError) {
-      throw new Error(`Failed to fetch image generation job for retry: ${fetchError.message}`)
-    }
-
-    const availableAt = new Date(Date.now() + retryDelaySeconds * 1000).toISOString()
-
-    const { error } = await client
-      .from('image_generation_jobs')
-      .update({
-        status: 'queued' as const,
-        retry_count: (currentJob?.retry_count || 0) + 1,
-        available_at: availableAt,
-        error_message: errorMessage,
-        worker_id: null,
-        started_at: null,
-        updated_at: new Date().toISOString(),
-      } as any)
-      .eq('id', jobId)
+    // Single atomic UPDATE: retry_count is incremented server-side (migration 083)
+    // @ts-ignore - RPC function not in generated types yet
+    const { error } = await client.rpc('requeue_image_generation_job_with_backoff', {
+      p_job_id: jobId,
+      p_retry_delay_seconds: retryDelaySeconds,
+      p_error_message: errorMessage,
+    })
 
     if (error) {
       throw new Error(`Failed to reset image generation job with backoff: ${error.message}`)
@@ -923,32 +1004,14 @@ export async function resetJobToPendingWithBackoff(
   return databaseClient.withRetry(async () => {
     const client = databaseClient.getClient()
     
-    // First get current retry_count
-    const { data: currentJob, error: fetchError } = await client
-      .from('export_jobs')
-      .select('retry_count')
-      .eq('id', jobId)
-      .single() as { data: { retry_count: number } | null; error: any }
-
-    if (fetchError) {
-      throw new Error(`Failed to fetch job for retry: ${fetchError.message}`)
-    }
-
-    // Calculate available_at timestamp
-    const availableAt = new Date(Date.now() + retryDelaySeconds * 1000).toISOString()
-    
-    const { error } = await client
-      .from('export_jobs')
-      .update({
-        status: 'pending' as const,
-        retry_count: (currentJob?.retry_count || 0) + 1,
-        available_at: availableAt,
-        error_message: errorMessage,
-        worker_id: null,
-        started_at: null,
-        updated_at: new Date().toISOString(),
-      } as any)
-      .eq('id', jobId)
+    // Single atomic UPDATE: retry_count is incremented and available_at is
+    // computed server-side (migration 083), so no read-then-write round-trip
+    // @ts-ignore - RPC function not in generated types yet
+    const { error } = await client.rpc('requeue_export_job_with_backoff', {
+      p_job_id: jobId,
+      p_retry_delay_seconds: retryDelaySeconds,
+      p_error_message: errorMessage,
+    })
 
     if (error) {
       throw new Error(`Failed to reset job with backoff: ${error.message}`)
@@ -1132,6 +1195,60 @@ export async function resetStaleJobs(): Promise<number> {
   }, 'resetStaleJobs')
 }
 
+/**
+ * Queue tables published to Supabase Realtime (migrations 010, 014, 036)
+ */
+const REALTIME_QUEUE_TABLES = [
+  'menu_extraction_jobs',
+  'image_generation_jobs',
+  'export_jobs',
+] as const
+
+/**
+ * Subscribe to inserts on the worker queue tables
+ *
+ * Realtime is the Supabase equivalent of LISTEN/NOTIFY: the subscription is
+ * opened once and lets an idle worker wake as soon as a job is enqueued
+ * instead of waiting out its polling interval. Rows requeued by retry
+ * backoff are UPDATEs and are still picked up by the polling fallback.
+ *
+ * Realtime reports connection failures through the subscribe status
+ * callback rather than by throwing, so they are passed to `onUnavailable`.
+ *
+ * @param onEnqueue - Called with the table name for each inserted row
+ * @param onUnavailable - Called with the channel status (CHANNEL_ERROR,
+ *   TIMED_OUT, CLOSED) whenever the subscription is not live. The CLOSED
+ *   that follows our own unsubscribe is not reported.
+ * @returns Function that closes the subscription
+ */
+export function subscribeToQueueInserts(
+  onEnqueue: (table: string) => void,
+  onUnavailable?: (status: string, error?: Error) => void
+): () => Promise<void> {
+  const client = databaseClient.getClient()
+
+  let channel = client.channel('worker-queue-inserts')
+  for (const table of REALTIME_QUEUE_TABLES) {
+    channel = channel.on(
+      'postgres_changes',
+      { event: 'INSERT', schema: 'public', table },
+      () => onEnqueue(table)
+    )
+  }
+  let unsubscribing = false
+  channel.subscribe((status, error) => {
+    if (status === 'SUBSCRIBED' || (status === 'CLOSED' && unsubscribing)) {
+      return
+    }
+    onUnavailable?.(status, error)
+  })
+
+  return async () => {
+    unsubscribing = true
+    await client.removeChannel(channel)
+  }
+}
+
 /**
  * Task 3.6: Get queue depth
  * 
@@ -49,6 +49,8 @@ interface WorkerConfig {
   jobTimeoutSeconds: number
   pollingIntervalBusyMs: number
   pollingIntervalIdleMs: number
+  extractionConcurrency: number
+  imageGenerationConcurrency: number
   gracefulShutdownTimeoutMs: number
   
   // Puppeteer
@@ -96,6 +98,8 @@ function loadConfig(): WorkerConfig {
   const jobTimeoutSeconds = parseInt(process.env.JOB_TIMEOUT_SECONDS || '60', 10)
   const pollingIntervalBusyMs = parseInt(process.env.POLLING_INTERVAL_BUSY_MS || '2000', 10)
   const pollingIntervalIdleMs = parseInt(process.env.POLLING_INTERVAL_IDLE_MS || '5000', 10)
+  const extractionConcurrency = parseInt(process.env.EXTRACTION_CONCURRENCY || '1', 10)
+  const imageGenerationConcurrency = parseInt(process.env.IMAGE_GENERATION_CONCURRENCY || '1', 10)
   const gracefulShutdownTimeoutMs = parseInt(process.env.GRACEFUL_SHUTDOWN_TIMEOUT_MS || '30000', 10)
   const healthCheckPort = parseInt(process.env.HEALTH_CHECK_PORT || '3000', 10)
   const metricsPort = parseInt(process.env.METRICS_PORT || '9090', 10)
@@ -110,6 +114,8 @@ function loadConfig(): WorkerConfig {
     jobTimeoutSeconds,
     pollingIntervalBusyMs,
     pollingIntervalIdleMs,
+    extractionConcurrency,
+    imageGenerationConcurrency,
     gracefulShutdownTimeoutMs,
     puppeteerExecutablePath: process.env.PUPPETEER_EXECUTABLE_PATH,
     healthCheckPort,
@@ -140,6 +146,8 @@ async function main() {
       job_timeout_seconds: config.jobTimeoutSeconds,
       polling_interval_busy_ms: config.pollingIntervalBusyMs,
       polling_interval_idle_ms: config.pollingIntervalIdleMs,
+      extraction_concurrency: config.extractionConcurrency,
+      image_generation_concurrency: config.imageGenerationConcurrency,
       graceful_shutdown_timeout_ms: config.gracefulShutdownTimeoutMs,
       health_check_port: config.healthCheckPort,
       metrics_port: config.metricsPort,
@@ -208,6 +216,8 @@ async function main() {
       workerId: config.workerId,
       pollingIntervalBusyMs: config.pollingIntervalBusyMs,
       pollingIntervalIdleMs: config.pollingIntervalIdleMs,
+      extractionConcurrency: config.extractionConcurrency,
+      imageGenerationConcurrency: config.imageGenerationConcurrency,
     })
     logInfo('Job poller initialized')
 
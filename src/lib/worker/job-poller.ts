@@ -4,19 +4,24 @@
  * Responsibilities:
  * - Start/stop polling loop
  * - Query for pending jobs where available_at <= NOW()
- * - Atomically claim one job
+ * - Atomically claim one job (extraction and image generation jobs are
+ *   claimed as many at a time as run concurrently)
  * - Dispatch claimed job to JobProcessor
  * - Implement adaptive polling (2s busy, 5s idle)
+ * - Wake immediately when a job is enqueued (Supabase Realtime)
  * 
  * Requirements: 2.1, 2.3, 12.7, 12.8
  */
 
 import {
   claimJob,
-  claimExtractionJob,
-  claimImageGenerationJob,
+  claimExtractionJobs,
+  releaseExtractionJobs,
+  claimImageGenerationJobs,
+  releaseImageGenerationJobs,
   claimStudioExportVariant,
   getQueueDepth,
+  subscribeToQueueInserts,
 } from './database-client'
 import { JobProcessor } from './job-processor'
 import type {
@@ -25,7 +30,7 @@ import type {
   ImageGenerationJob,
   StudioExportVariantJob,
 } from './database-client'
-import { logJobEvent, logInfo, logWarning, logError } from './logger'
+import { logJobEvent, logInfo, logWarning, logError, logDebug } from './logger'
 import {
   updateQueueDepth,
   incrementProcessingJobs,
@@ -37,17 +42,38 @@ export interface JobPollerConfig {
   workerId: string
   pollingIntervalBusyMs?: number
   pollingIntervalIdleMs?: number
+  extractionConcurrency?: number
+  imageGenerationConcurrency?: number
   onJobStart?: (jobPromise: Promise<void>) => void
   onJobComplete?: () => void
 }
 
+/**
+ * Clamp a concurrency setting to a whole number >= 1
+ *
+ * Settings come from parseInt on environment variables, so an unparsable
+ * value arrives as NaN. Math.max(1, NaN) is NaN, and splice(0, NaN) takes
+ * nothing, which would strand a claimed batch in 'processing'.
+ */
+function toPositiveCount(value: number | undefined, fallback: number): number {
+  if (value === undefined || !Number.isFinite(value)) {
+    return fallback
+  }
+  return Math.max(1, Math.floor(value))
+}
+
 export class JobPoller {
   private processor: JobProcessor
   private workerId: string
   private pollingIntervalBusyMs: number
   private pollingIntervalIdleMs: number
+  private extractionConcurrency: number
+  private imageGenerationConcurrency: number
   private isRunning: boolean = false
   private pollingTimeout: NodeJS.Timeout | null = null
+  private wakeRequested: boolean = false
+  private inFlightClaim: Promise<void> | null = null
+  private unsubscribeFromQueue: (() => Promise<void>) | null = null
   private onJobStart?: (jobPromise: Promise<void>) => void
   private onJobComplete?: () => void
 
@@ -56,6 +82,8 @@ export class JobPoller {
     this.workerId = config.workerId
     this.pollingIntervalBusyMs = config.pollingIntervalBusyMs ?? 2000
     this.pollingIntervalIdleMs = config.pollingIntervalIdleMs ?? 5000
+    this.extractionConcurrency = toPositiveCount(config.extractionConcurrency, 1)
+    this.imageGenerationConcurrency = toPositiveCount(config.imageGenerationConcurrency, 1)
     this.onJobStart = config.onJobStart
     this.onJobComplete = config.onJobComplete
   }
@@ -81,8 +109,13 @@ export class JobPoller {
       worker_id: this.workerId,
       busy_interval_ms: this.pollingIntervalBusyMs,
       idle_interval_ms: this.pollingIntervalIdleMs,
+      extraction_concurrency: this.extractionConcurrency,
+      image_generation_concurrency: this.imageGenerationConcurrency,
     })
 
+    // Register for enqueue notifications once, before the first poll
+    this.subscribeToQueue()
+
     // Start the polling loop
     await this.poll()
   }
@@ -91,6 +124,8 @@ export class JobPoller {
    * Stop the polling loop gracefully
    * 
    * Stops polling for new jobs. Does not interrupt currently processing job.
+   * Waits for a claim that is still in flight and returns its jobs to the
+   * queue, so nothing is left in 'processing' when the process exits.
    * 
    * Requirements: 2.1
    */
@@ -111,6 +146,23 @@ export class JobPoller {
       this.pollingTimeout = null
     }
 
+    if (this.unsubscribeFromQueue) {
+      const unsubscribe = this.unsubscribeFromQueue
+      this.unsubscribeFromQueue = null
+      try {
+        await unsubscribe()
+      } catch (error) {
+        logWarning('Failed to close queue subscription', {
+          worker_id: this.workerId,
+          error: error instanceof Error ? error.message : String(error),
+        })
+      }
+    }
+
+    if (this.inFlightClaim) {
+      await this.inFlightClaim
+    }
+
     logInfo('JobPoller stopped', { worker_id: this.workerId })
   }
 
@@ -130,21 +182,40 @@ export class JobPoller {
       return
     }
 
+    // This poll checks every queue, which covers any notification received
+    // before it started
+    this.wakeRequested = false
+
     try {
-      // 1. Attempt to claim an extraction job (higher priority for UX)
-      const extractionJob = await this.claimExtractionJob()
-      if (extractionJob) {
-        logInfo('Claimed extraction job', { job_id: extractionJob.id })
+      // 1. Claim extraction jobs (higher priority for UX). Extraction is
+      //    dominated by waiting on the vision model, so up to
+      //    extractionConcurrency jobs run side by side. Only as many are
+      //    claimed as start right away, as for image generation below.
+      const extractionJobs = await this.trackClaim(
+        this.claimExtractionJobs(),
+        (jobs) => this.releaseExtractionJobs(jobs)
+      )
+
+      if (!this.isRunning) {
+        return
+      }
+
+      if (extractionJobs.length > 0) {
+        for (const extractionJob of extractionJobs) {
+          logInfo('Claimed extraction job', { job_id: extractionJob.id })
+        }
         
-        incrementProcessingJobs(this.workerId)
-        const jobPromise = this.processor.processExtraction(extractionJob)
+        const jobPromise = this.processJobsConcurrently(
+          extractionJobs,
+          (job) => this.processor.processExtraction(job),
+          'extraction'
+        )
         
         if (this.onJobStart) {
           this.onJobStart(jobPromise)
         }
 
         await jobPromise
-        decrementProcessingJobs(this.workerId)
 
         if (this.onJobComplete) {
           this.onJobComplete()
@@ -157,24 +228,38 @@ export class JobPoller {
         }
       }
 
-      // 2. Attempt to claim an image generation job
-      const imageGenerationJob = await this.claimImageGenerationJob()
-      if (imageGenerationJob) {
-        logInfo('Claimed image generation job', {
-          job_id: imageGenerationJob.id,
-          priority: imageGenerationJob.priority,
-          retry_count: imageGenerationJob.retry_count,
-        })
+      // 2. Claim image generation jobs. Each runs for tens of seconds, so only
+      //    as many are claimed as start right away: a claimed job waiting its
+      //    turn would sit in 'processing' where idle workers cannot take it.
+      const imageGenerationJobs = await this.trackClaim(
+        this.claimImageGenerationJobs(),
+        (jobs) => this.releaseImageGenerationJobs(jobs)
+      )
 
-        incrementProcessingJobs(this.workerId)
-        const jobPromise = this.processor.processImageGeneration(imageGenerationJob)
+      if (!this.isRunning) {
+        return
+      }
+
+      if (imageGenerationJobs.length > 0) {
+        for (const imageGenerationJob of imageGenerationJobs) {
+          logInfo('Claimed image generation job', {
+            job_id: imageGenerationJob.id,
+            priority: imageGenerationJob.priority,
+            retry_count: imageGenerationJob.retry_count,
+          })
+        }
+
+        const jobPromise = this.processJobsConcurrently(
+          imageGenerationJobs,
+          (job) => this.processor.processImageGeneration(job),
+          'image generation'
+        )
 
         if (this.onJobStart) {
           this.onJobStart(jobPromise)
         }
 
         await jobPromise
-        decrementProcessingJobs(this.workerId)
 
         if (this.onJobComplete) {
           this.onJobComplete()
@@ -276,12 +361,106 @@ export class JobPoller {
     if (this.isRunning) {
       const interval = await this.getPollingInterval()
 
+      // A job was enqueued while this poll was running, possibly into a queue
+      // it had already checked. Poll once more instead of sleeping.
+      if (this.wakeRequested && this.isRunning) {
+        this.poll()
+        return
+      }
+
       this.pollingTimeout = setTimeout(() => {
+        this.pollingTimeout = null
         this.poll()
       }, interval)
     }
   }
 
+  /**
+   * Process claimed jobs concurrently and wait for all of them
+   *
+   * Resolves once every job has settled so the graceful shutdown handler,
+   * which tracks a single promise, waits for the whole group. A job that
+   * throws is logged without cutting its siblings short.
+   */
+  private async processJobsConcurrently<T extends { id: string }>(
+    jobs: T[],
+    processJob: (job: T) => Promise<void>,
+    jobType: string
+  ): Promise<void> {
+    const results = await Promise.allSettled(
+      jobs.map(async (job) => {
+        incrementProcessingJobs(this.workerId)
+        try {
+          await processJob(job)
+        } finally {
+          decrementProcessingJobs(this.workerId)
+        }
+      })
+    )
+
+    results.forEach((result, index) => {
+      if (result.status === 'rejected') {
+        logError(`Error processing ${jobType} job`, result.reason as Error, {
+          worker_id: this.workerId,
+          job_id: jobs[index].id,
+        })
+      }
+    })
+  }
+
+  /**
+   * Open the enqueue subscription, falling back to polling if it fails
+   *
+   * Polling continues on its normal interval regardless, so a channel that
+   * errors or times out only costs wake-up latency.
+   */
+  private subscribeToQueue(): void {
+    try {
+      this.unsubscribeFromQueue = subscribeToQueueInserts(
+        (table) => this.wake(table),
+        (status, error) => {
+          logWarning('Queue notifications unavailable, relying on polling', {
+            worker_id: this.workerId,
+            status,
+            error: error?.message,
+          })
+        }
+      ) ?? null
+    } catch (error) {
+      logWarning('Queue notifications unavailable, relying on polling', {
+        worker_id: this.workerId,
+        error: error instanceof Error ? error.message : String(error),
+      })
+    }
+  }
+
+  /**
+   * Cut the idle wait short when a job is enqueued
+   *
+   * While the loop is sleeping between polls, polls immediately. While a poll
+   * is in flight, only records that a wake was requested: a burst of inserts
+   * collapses into a single follow-up poll rather than one per notification.
+   */
+  private wake(table: string): void {
+    if (!this.isRunning) {
+      return
+    }
+
+    if (!this.pollingTimeout) {
+      this.wakeRequested = true
+      return
+    }
+
+    clearTimeout(this.pollingTimeout)
+    this.pollingTimeout = null
+
+    logDebug('Job enqueued, polling immediately', {
+      worker_id: this.workerId,
+      table,
+    })
+    this.poll()
+  }
+
   /**
    * Atomically claim one export job from the queue
    */
@@ -297,30 +476,121 @@ export class JobPoller {
   }
 
   /**
-   * Atomically claim one extraction job from the queue
+   * Track a batch claim so stop() can wait for it
+   *
+   * If the poller stopped while the claim was on the wire, the claimed jobs
+   * are released instead of returned. stop() awaits this, so graceful
+   * shutdown cannot exit between the claim committing and the release.
    */
-  private async claimExtractionJob(): Promise<ExtractionJob | null> {
+  private async trackClaim<T>(
+    claim: Promise<T[]>,
+    release: (jobs: T[]) => Promise<void>
+  ): Promise<T[]> {
+    const settled = claim.then(async (jobs) => {
+      if (this.isRunning) {
+        return jobs
+      }
+      await release(jobs)
+      return []
+    })
+    this.inFlightClaim = settled.then(() => undefined)
+
     try {
-      return await claimExtractionJob(this.workerId)
+      return await settled
+    } finally {
+      this.inFlightClaim = null
+    }
+  }
+
+  /**
+   * Atomically claim up to extractionConcurrency extraction jobs
+   */
+  private async claimExtractionJobs(): Promise<ExtractionJob[]> {
+    try {
+      const jobs = (await claimExtractionJobs(this.workerId, this.extractionConcurrency)) ?? []
+      if (jobs.length > 1) {
+        logInfo('Claimed extraction job batch', {
+          worker_id: this.workerId,
+          count: jobs.length,
+        })
+      }
+      return jobs
     } catch (error) {
-      logError('Error claiming extraction job', error as Error, {
+      logError('Error claiming extraction jobs', error as Error, {
         worker_id: this.workerId,
       })
-      return null
+      return []
+    }
+  }
+
+  /**
+   * Return extraction jobs claimed as the poller was stopping
+   */
+  private async releaseExtractionJobs(unstarted: ExtractionJob[]): Promise<void> {
+    if (unstarted.length === 0) {
+      return
+    }
+
+    try {
+      const released = await releaseExtractionJobs(
+        unstarted.map((job) => job.id),
+        this.workerId
+      )
+      logInfo('Released unstarted extraction jobs', {
+        worker_id: this.workerId,
+        count: released,
+      })
+    } catch (error) {
+      logError('Error releasing extraction jobs', error as Error, {
+        worker_id: this.workerId,
+        job_ids: unstarted.map((job) => job.id),
+      })
     }
   }
 
   /**
-   * Atomically claim one image generation job from the queue
+   * Atomically claim up to imageGenerationConcurrency image generation jobs
    */
-  private async claimImageGenerationJob(): Promise<ImageGenerationJob | null> {
+  private async claimImageGenerationJobs(): Promise<ImageGenerationJob[]> {
     try {
-      return await claimImageGenerationJob(this.workerId)
+      const jobs = (await claimImageGenerationJobs(this.workerId, this.imageGenerationConcurrency)) ?? []
+      if (jobs.length > 1) {
+        logInfo('Claimed image generation job batch', {
+          worker_id: this.workerId,
+          count: jobs.length,
+        })
+      }
+      return jobs
     } catch (error) {
-      logError('Error claiming image generation job', error as Error, {
+      logError('Error claiming image generation jobs', error as Error, {
         worker_id: this.workerId,
       })
-      return null
+      return []
+    }
+  }
+
+  /**
+   * Return image generation jobs claimed as the poller was stopping
+   */
+  private async releaseImageGenerationJobs(unstarted: ImageGenerationJob[]): Promise<void> {
+    if (unstarted.length === 0) {
+      return
+    }
+
+    try {
+      const released = await releaseImageGenerationJobs(
+        unstarted.map((job) => job.id),
+        this.workerId
+      )
+      logInfo('Released unstarted image generation jobs', {
+        worker_id: this.workerId,
+        count: released,
+      })
+    } catch (error) {
+      logError('Error releasing image generation jobs', error as Error, {
+        worker_id: this.workerId,
+        job_ids: unstarted.map((job) => job.id),
+      })
     }
   }
 
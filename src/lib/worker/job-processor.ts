@@ -38,8 +38,9 @@ import {
 } from './database-client'
 import { analyticsOperations } from '@/lib/analytics-server'
 import { notificationService } from '@/lib/notification-service'
-import { createMenuExtractionService } from '@/lib/extraction/menu-extraction-service'
+import { createMenuExtractionService, type MenuExtractionService } from '@/lib/extraction/menu-extraction-service'
 import { createWorkerSupabaseClient } from '@/lib/supabase-worker'
+import { rewriteLocalhostToGateway } from '@/lib/docker-host'
 import { getPromptPackage } from '@/lib/extraction/prompt-stage1'
 import { getPromptPackageV2 } from '@/lib/extraction/prompt-stage2'
 import type { PDFOptions, ImageOptions, RenderSnapshot } from '@/types'
@@ -67,6 +68,8 @@ export class JobProcessor {
   private renderer: PuppeteerRenderer
   private storageClient: StorageClient
   private jobTimeoutSeconds: number
+  private extractionService: MenuExtractionService | null = null
+  private extractionServiceApiKey: string | null = null
 
   constructor(config: JobProcessorConfig) {
     this.renderer = config.renderer
@@ -253,13 +256,9 @@ export class JobProcessor {
       // NOTE: The image_url may be a local Supabase URL like http://localhost:54321/...
       // When running inside Docker, localhost points to the container, not the host.
       // Rewrite to host.docker.internal so the worker can fetch the image for preprocessing.
-      const imageUrlForWorker = rewriteLocalhostUrlForDocker(job.image_url)
+      const imageUrlForWorker = rewriteLocalhostToGateway(job.image_url)
 
-      // Create extraction service with worker's Supabase client
-      // IMPORTANT: Workers must not use Next.js cookie-based clients.
-      // Use the direct worker client (service role) instead.
-      const supabase = createWorkerSupabaseClient()
-      const extractionService = createMenuExtractionService(openaiApiKey, supabase)
+      const extractionService = this.getExtractionService(openaiApiKey)
 
       // Build prompt package based on schema version
       const useStage2 = job.schema_version === 'stage2'
@@ -310,6 +309,22 @@ export class JobProcessor {
     }
   }
 
+  /**
+   * Reuse one extraction service (and its OpenAI + Supabase clients) across
+   * jobs so each job doesn't pay for new HTTP agents and connection setup.
+   * Rebuilt only if the API key changes.
+   */
+  private getExtractionService(openaiApiKey: string): MenuExtractionService {
+    if (!this.extractionService || this.extractionServiceApiKey !== openaiApiKey) {
+      // IMPORTANT: Workers must not use Next.js cookie-based clients.
+      // Use the direct worker client (service role) instead.
+      const supabase = createWorkerSupabaseClient()
+      this.extractionService = createMenuExtractionService(openaiApiKey, supabase)
+      this.extractionServiceApiKey = openaiApiKey
+    }
+    return this.extractionService
+  }
+
   /**
    * Process a single AI image generation job.
    */
@@ -407,7 +422,7 @@ export class JobProcessor {
       // Rewrites any localhost/127.0.0.1 (Supabase :54321, Next app :3000 for demo images) to host.docker.internal.
       const translateUrl = (url?: string) => {
         if (!url) return url
-        return rewriteLocalhostUrlForDocker(url)
+        return rewriteLocalhostToGateway(url)
       }
 
       // 2. Read configuration up-front (needed for image mode and layout options)
@@ -558,7 +573,7 @@ export class JobProcessor {
       // Rewrites any localhost/127.0.0.1 (Supabase :54321, Next app :3000 for demo images) to host.docker.internal.
       const translateUrl = (url?: string) => {
         if (!url) return url
-        return rewriteLocalhostUrlForDocker(url)
+        return rewriteLocalhostToGateway(url)
       }
 
       // 2. Read configuration up-front (needed for image mode and layout options)
@@ -1111,20 +1126,3 @@ function slugifyForFilename(input: string): string {
     .replace(/[\s_-]+/g, '-')
     .replace(/^-+|-+$/g, '') || 'export'
 }
-
-function rewriteLocalhostUrlForDocker(inputUrl: string): string {
-  try {
-    const url = new URL(inputUrl)
-
-    // Only rewrite true localhost-style URLs.
-    if (url.hostname !== 'localhost' && url.hostname !== '127.0.0.1') {
-      return inputUrl
-    }
-
-    // In Docker Desktop, host.docker.internal is the host gateway (works with --add-host on Linux too).
-    url.hostname = process.env.WORKER_HOST_GATEWAY || 'host.docker.internal'
-    return url.toString()
-  } catch {
-    return inputUrl
-  }
-}
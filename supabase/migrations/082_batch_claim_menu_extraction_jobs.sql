@@ -0,0 +1,79 @@
+-- ============================================================================
+-- Migration 082: Claim menu extraction jobs in batches
+--
+-- claim_menu_extraction_job hands out one row per RPC, so draining a burst of
+-- uploads costs one PostgREST round-trip per job. This variant claims up to
+-- p_batch_size rows in a single UPDATE ... RETURNING using the same
+-- FOR UPDATE SKIP LOCKED ordering, so concurrent workers still never share a
+-- row. The single-row function (049) is left in place.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION claim_menu_extraction_jobs(
+  p_worker_id TEXT,
+  p_batch_size INTEGER DEFAULT 1
+)
+RETURNS TABLE (
+  id UUID,
+  user_id UUID,
+  menu_id UUID,
+  image_url TEXT,
+  image_hash TEXT,
+  status TEXT,
+  schema_version TEXT,
+  prompt_version TEXT,
+  retry_count INTEGER,
+  priority INTEGER,
+  worker_id TEXT,
+  available_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ,
+  started_at TIMESTAMPTZ
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  -- RETURNS TABLE columns are plpgsql variables, so every column reference
+  -- below is qualified (see migration 049).
+  RETURN QUERY
+  WITH claimed AS (
+    UPDATE menu_extraction_jobs AS me
+    SET
+      status = 'processing',
+      worker_id = p_worker_id,
+      started_at = NOW(),
+      updated_at = NOW()
+    WHERE me.id = ANY(ARRAY(
+      SELECT m.id
+      FROM menu_extraction_jobs AS m
+      WHERE m.status = 'queued'
+        AND m.available_at <= NOW()
+      ORDER BY m.priority DESC, m.created_at ASC
+      LIMIT GREATEST(p_batch_size, 1)
+      FOR UPDATE SKIP LOCKED
+    ))
+    RETURNING me.*
+  )
+  SELECT
+    c.id::UUID,
+    c.user_id::UUID,
+    c.menu_id::UUID,
+    c.image_url::TEXT,
+    c.image_hash::TEXT,
+    c.status::TEXT,
+    c.schema_version::TEXT,
+    c.prompt_version::TEXT,
+    c.retry_count::INTEGER,
+    c.priority::INTEGER,
+    c.worker_id::TEXT,
+    c.available_at::TIMESTAMPTZ,
+    c.created_at::TIMESTAMPTZ,
+    c.updated_at::TIMESTAMPTZ,
+    c.started_at::TIMESTAMPTZ
+  FROM claimed AS c
+  ORDER BY c.priority DESC, c.created_at ASC;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION claim_menu_extraction_jobs(TEXT, INTEGER) TO service_role;
+
+COMMENT ON FUNCTION claim_menu_extraction_jobs(TEXT, INTEGER) IS 'Atomically claims up to p_batch_size queued menu extraction jobs in one statement. Uses FOR UPDATE SKIP LOCKED and respects available_at for retry backoff.';
@@ -0,0 +1,99 @@
+-- ============================================================================
+-- Migration 083: Requeue failed queue rows in a single statement
+--
+-- The worker's retry path read retry_count with one PostgREST request and
+-- wrote retry_count + 1 with a second. Besides doubling the round-trips on
+-- every transient failure, a concurrent writer could land between the two.
+-- These functions increment retry_count in place, so a requeue is one atomic
+-- UPDATE and one round-trip.
+-- ============================================================================
+
+-- ---------------------------------------------------------------------------
+-- export_jobs (returned to 'pending', see 036/037)
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION requeue_export_job_with_backoff(
+    p_job_id UUID,
+    p_retry_delay_seconds NUMERIC,
+    p_error_message TEXT
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE export_jobs
+    SET status = 'pending',
+        retry_count = COALESCE(retry_count, 0) + 1,
+        available_at = NOW() + p_retry_delay_seconds * INTERVAL '1 second',
+        error_message = p_error_message,
+        worker_id = NULL,
+        started_at = NULL,
+        updated_at = NOW()
+    WHERE id = p_job_id;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION requeue_export_job_with_backoff(UUID, NUMERIC, TEXT) TO service_role;
+
+COMMENT ON FUNCTION requeue_export_job_with_backoff(UUID, NUMERIC, TEXT) IS
+    'Returns an export job to pending with retry_count incremented and available_at pushed out by the backoff delay.';
+
+-- ---------------------------------------------------------------------------
+-- image_generation_jobs
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION requeue_image_generation_job_with_backoff(
+    p_job_id UUID,
+    p_retry_delay_seconds NUMERIC,
+    p_error_message TEXT
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE image_generation_jobs
+    SET status = 'queued',
+        retry_count = COALESCE(retry_count, 0) + 1,
+        available_at = NOW() + p_retry_delay_seconds * INTERVAL '1 second',
+        error_message = p_error_message,
+        worker_id = NULL,
+        started_at = NULL,
+        updated_at = NOW()
+    WHERE id = p_job_id;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION requeue_image_generation_job_with_backoff(UUID, NUMERIC, TEXT) TO service_role;
+
+COMMENT ON FUNCTION requeue_image_generation_job_with_backoff(UUID, NUMERIC, TEXT) IS
+    'Returns an image generation job to queued with retry_count incremented and available_at pushed out by the backoff delay.';
+
+-- ---------------------------------------------------------------------------
+-- studio_export_variants (see 078)
+-- ---------------------------------------------------------------------------
+
+CREATE OR REPLACE FUNCTION requeue_studio_export_variant_with_backoff(
+    p_variant_id UUID,
+    p_retry_delay_seconds NUMERIC,
+    p_error_message TEXT
+)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    UPDATE studio_export_variants
+    SET status = 'queued',
+        retry_count = COALESCE(retry_count, 0) + 1,
+        available_at = NOW() + p_retry_delay_seconds * INTERVAL '1 second',
+        error_message = LEFT(p_error_message, 500),
+        worker_id = NULL,
+        started_at = NULL,
+        updated_at = NOW()
+    WHERE id = p_variant_id;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION requeue_studio_export_variant_with_backoff(UUID, NUMERIC, TEXT) TO service_role;
+
+COMMENT ON FUNCTION requeue_studio_export_variant_with_backoff(UUID, NUMERIC, TEXT) IS
+    'Returns a Studio export variant to queued with retry_count incremented and available_at pushed out by the backoff delay.';
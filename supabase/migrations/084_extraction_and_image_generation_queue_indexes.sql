@@ -0,0 +1,24 @@
+-- ============================================================================
+-- Migration 084: Partial queue indexes for extraction and image generation
+--
+-- claim_menu_extraction_job(s) and claim_image_generation_job scan
+--   status = 'queued' AND available_at <= NOW()
+--   ORDER BY priority DESC, created_at ASC
+-- but the only ordered indexes (046/065) cover every row, so the claim walks
+-- past the completed/failed history that grows without bound. A partial
+-- index over queued rows stays the size of the live queue, matching
+-- idx_export_jobs_queue (036) and idx_studio_export_variants_queue (078).
+-- Leading with the sort keys lets the claim's LIMIT stop at the first
+-- eligible rows; available_at is carried so backoff is filtered in-index.
+--
+-- Not built CONCURRENTLY: migrations run inside a transaction, and the
+-- queued subset is small at any moment.
+-- ============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_menu_extraction_jobs_queue
+    ON menu_extraction_jobs (priority DESC, created_at ASC, available_at)
+    WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS idx_gen_jobs_queue
+    ON image_generation_jobs (priority DESC, created_at ASC, available_at)
+    WHERE status = 'queued';
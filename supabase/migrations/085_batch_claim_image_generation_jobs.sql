@@ -0,0 +1,96 @@
+-- ============================================================================
+-- Migration 085: Claim image generation jobs in batches
+--
+-- Same shape as claim_menu_extraction_jobs (082). A worker running several
+-- image generation jobs in parallel claims them in one UPDATE ... RETURNING
+-- with FOR UPDATE SKIP LOCKED instead of one claim_image_generation_job RPC
+-- per job, and concurrent workers still never share a row. The worker only
+-- claims as many jobs as it starts at once. The single-row function (065) is
+-- left in place.
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION claim_image_generation_jobs(
+  p_worker_id TEXT,
+  p_batch_size INTEGER DEFAULT 1
+)
+RETURNS TABLE (
+  id UUID,
+  user_id UUID,
+  menu_id UUID,
+  menu_item_id UUID,
+  batch_id UUID,
+  status TEXT,
+  prompt TEXT,
+  negative_prompt TEXT,
+  api_params JSONB,
+  number_of_variations INTEGER,
+  result_count INTEGER,
+  error_message TEXT,
+  error_code TEXT,
+  processing_time INTEGER,
+  estimated_cost NUMERIC,
+  retry_count INTEGER,
+  priority INTEGER,
+  worker_id TEXT,
+  available_at TIMESTAMPTZ,
+  created_at TIMESTAMPTZ,
+  updated_at TIMESTAMPTZ,
+  started_at TIMESTAMPTZ,
+  completed_at TIMESTAMPTZ
+)
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  -- RETURNS TABLE columns are plpgsql variables, so every column reference
+  -- below is qualified (see migration 049).
+  RETURN QUERY
+  WITH claimed AS (
+    UPDATE image_generation_jobs AS ig
+    SET
+      status = 'processing',
+      worker_id = p_worker_id,
+      started_at = NOW(),
+      updated_at = NOW()
+    WHERE ig.id = ANY(ARRAY(
+      SELECT g.id
+      FROM image_generation_jobs AS g
+      WHERE g.status = 'queued'
+        AND g.available_at <= NOW()
+      ORDER BY g.priority DESC, g.created_at ASC
+      LIMIT GREATEST(p_batch_size, 1)
+      FOR UPDATE SKIP LOCKED
+    ))
+    RETURNING ig.*
+  )
+  SELECT
+    c.id,
+    c.user_id,
+    c.menu_id,
+    c.menu_item_id,
+    c.batch_id,
+    c.status::TEXT,
+    c.prompt,
+    c.negative_prompt,
+    c.api_params,
+    c.number_of_variations,
+    c.result_count,
+    c.error_message,
+    c.error_code::TEXT,
+    c.processing_time,
+    c.estimated_cost,
+    c.retry_count,
+    c.priority,
+    c.worker_id,
+    c.available_at,
+    c.created_at,
+    c.updated_at,
+    c.started_at,
+    c.completed_at
+  FROM claimed AS c
+  ORDER BY c.priority DESC, c.created_at ASC;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION claim_image_generation_jobs(TEXT, INTEGER) TO service_role;
+
+COMMENT ON FUNCTION claim_image_generation_jobs(TEXT, INTEGER) IS 'Atomically claims up to p_batch_size queued image generation jobs in one statement. Uses FOR UPDATE SKIP LOCKED and respects available_at for retry backoff.';